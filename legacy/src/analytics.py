@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from src.core.paths import (
+    atomic_write_json,
     data_dir,
     ensure_data_layout,
     legacy_or_data_path,
@@ -27,7 +28,7 @@ def load_analytics() -> Dict[str, Any]:
     p = analytics_file()
     if p.exists():
         try:
-            return json.loads(p.read_text())
+            return json.loads(p.read_text(encoding="utf-8"))
         except Exception:
             pass
     return {
@@ -39,7 +40,7 @@ def load_analytics() -> Dict[str, Any]:
 
 def save_analytics(data: Dict[str, Any]) -> None:
     p = analytics_file()
-    p.write_text(json.dumps(data, indent=2))
+    atomic_write_json(p, data)
 
 
 def record_task_completion(
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import json
+import os
 import shutil
+import tempfile
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterable
+
+# mkstemp creates 0600 files; written files get the usual umask-based mode.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
 
 
 def project_root() -> Path:
@@ -52,3 +59,40 @@ def legacy_or_data_path(name: str) -> Path:
     if data.exists():
         return data
     return legacy
+
+
+def atomic_write_text(path: Path, data: str) -> os.stat_result:
+    """Write data to path via a unique temp file + rename.
+
+    Readers (including other processes) see either the old or the new
+    contents, never a truncated file. Returns the written file's stat, taken
+    before the rename so it cannot describe another writer's file.
+    """
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            os.fchmod(f.fileno(), 0o666 & ~_UMASK)
+            f.write(data.encode("utf-8"))
+            f.flush()
+            st = os.fstat(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return st
+
+
+def compact_json(obj: Any) -> str:
+    """Serialize obj the way atomic_write_json stores it."""
+
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def atomic_write_json(path: Path, obj: Any) -> None:
+    """Atomically write obj as compact JSON; machine-read files skip indent."""
+
+    atomic_write_text(path, compact_json(obj))
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Dict
 
 from src.core.paths import (
+    atomic_write_json,
     data_dir,
     ensure_data_layout,
     legacy_or_data_path,
@@ -26,7 +27,7 @@ def load_cache() -> Dict[str, bool]:
     p = computer_task_cache_file()
     if p.exists():
         try:
-            return json.loads(p.read_text())
+            return json.loads(p.read_text(encoding="utf-8"))
         except Exception:
             return {}
     return {}
@@ -34,7 +35,7 @@ def load_cache() -> Dict[str, bool]:
 
 def save_cache(cache: Dict[str, bool]) -> None:
     p = computer_task_cache_file()
-    p.write_text(json.dumps(cache, indent=2))
+    atomic_write_json(p, cache)
 
 
 def task_hash(text: str) -> str:
@@ -59,11 +59,9 @@ class TaskNotifier:
                 self.active_overlays.pop(task_id, None)
 
     def is_task_completed(self, task) -> bool:
-        if hasattr(task, "is_completed") and task.is_completed:
+        if getattr(task, "is_completed", False):
             return True
-        if hasattr(task, "completed_at") and task.completed_at is not None:
-            return True
-        return False
+        return getattr(task, "completed_at", None) is not None
 
     def to_datetime(self, d) -> Optional[dt.datetime]:
         if d is None:
@@ -1,16 +1,39 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 from src.core.paths import (
+    atomic_write_text,
+    compact_json,
     data_dir,
     ensure_data_layout,
     legacy_or_data_path,
     migrate_legacy_files,
 )
 
+# Text of the state last read or written by this process, keyed by the
+# file's stat signature. The notifier daemon and the overlay subprocess share
+# the file, so the text is only reused while the file on disk is unchanged.
+# Each load re-parses it, so callers never share a dict.
+_STATE_CACHE_TEXT: Optional[str] = None
+_STATE_CACHE_KEY: Optional[Tuple[str, int, int, int]] = None
+
+
+def _cache_key(p: Path, st: os.stat_result) -> Tuple[str, int, int, int]:
+    # os.replace installs a new inode, so st_ino tells writes apart even
+    # within one mtime tick.
+    return (str(p), st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _stat_key(p: Path) -> Optional[Tuple[str, int, int, int]]:
+    try:
+        return _cache_key(p, p.stat())
+    except OSError:
+        return None
+
 
 def state_file() -> Path:
     ensure_data_layout()
@@ -22,15 +45,31 @@ def state_file() -> Path:
 
 
 def load_state() -> Dict[str, Any]:
+    global _STATE_CACHE_KEY, _STATE_CACHE_TEXT
     p = state_file()
-    if p.exists():
+    key = _stat_key(p)
+    if key is not None:
+        if _STATE_CACHE_TEXT is not None and key == _STATE_CACHE_KEY:
+            return json.loads(_STATE_CACHE_TEXT)
         try:
-            return json.loads(p.read_text())
-        except Exception:
+            text = p.read_text(encoding="utf-8")
+            state = json.loads(text)
+        except (OSError, ValueError):
+            # A file removed since the stat, or one edited by hand.
             pass
+        else:
+            _STATE_CACHE_KEY, _STATE_CACHE_TEXT = key, text
+            return state
     return {"active_tasks": {}, "completed_tasks": []}
 
 
 def save_state(state: Dict[str, Any]) -> None:
+    global _STATE_CACHE_KEY, _STATE_CACHE_TEXT
     p = state_file()
-    p.write_text(json.dumps(state, indent=2))
+    text = compact_json(state)
+    # Nothing to do if the file is still the one we last read or wrote and
+    # its contents would not change.
+    if text == _STATE_CACHE_TEXT and _stat_key(p) == _STATE_CACHE_KEY:
+        return
+    st = atomic_write_text(p, text)
+    _STATE_CACHE_KEY, _STATE_CACHE_TEXT = _cache_key(p, st), text
@@ -29,18 +29,12 @@ class TaskScheduler:
         self.life_block_cache: dict[dt.date, set[dt.datetime]] = {}
 
     def fetch_tasks(self) -> None:
-        self.tasks = []
-        for page in self.api.get_tasks():
-            self.tasks.extend(page)
-
+        # Filtered page by page as the SDK yields them.
         self.tasks = [
             task
-            for task in self.tasks
-            if not (
-                hasattr(task, "labels")
-                and task.labels
-                and "#testnotification" in task.labels
-            )
+            for page in self.api.get_tasks()
+            for task in page
+            if "#testnotification" not in (getattr(task, "labels", None) or ())
         ]
 
     def apply_auto_priorities(self) -> None:
@@ -60,11 +54,9 @@ class TaskScheduler:
                 pass
 
     def is_task_completed(self, task) -> bool:
-        if hasattr(task, "is_completed") and task.is_completed:
-            return True
-        if hasattr(task, "completed_at") and task.completed_at is not None:
+        if getattr(task, "is_completed", False):
             return True
-        return False
+        return getattr(task, "completed_at", None) is not None
 
     def should_skip_reschedule(self, task) -> bool:
         labels = getattr(task, "labels", []) or []
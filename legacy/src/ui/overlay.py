@@ -1,83 +1,244 @@
 from __future__ import annotations
 
+import datetime as dt
+import functools
 import json
 import os
 import subprocess
 import sys
-import tempfile
+import threading
 import time
 import tkinter as tk
 import tkinter.font as tkfont
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-import requests
-from todoist_api_python.api import TodoistAPI
-
-from src.analytics import record_task_completion
 from src.overlay_state import load_state, save_state
-from src.integrations.openrouter import estimate_minutes
 from src.scheduler.constants import (
     WEEKDAY_START_HOUR,
     WEEKDAY_START_MINUTE,
     WEEKEND_START_HOUR,
 )
 
+# Timer ticks (one per elapsed second) between writes of the overlay state.
+STATE_FLUSH_TICKS = 30
+# completed_tasks entries kept in the overlay state; full history lives in
+# the analytics file.
+COMPLETED_TASKS_KEPT = 100
+# Sequences bound on the root by build_full_screen / build_corner.
+ROOT_BINDINGS = (
+    "<Escape>",
+    "<Command-w>",
+    "<Command-q>",
+    "<Button-1>",
+    "<B1-Motion>",
+    "<ButtonRelease-1>",
+    "<Visibility>",
+)
+# (tag, sequence, method, args) bound on the corner canvas items. hover_btns
+# covers both the Complete shell and its label.
+CORNER_TAG_BINDINGS = (
+    ("hover_btns", "<Button-1>", "on_done", ()),
+    ("btn_complete", "<Enter>", "_set_fill", ("btn_complete", "#cccccc")),
+    ("btn_complete", "<Leave>", "_set_fill", ("btn_complete", "#ffffff")),
+)
+
+# NSWindow level the overlay is pinned to on macOS (NSStatusWindowLevel).
+NS_STATUS_WINDOW_LEVEL = 25
+# Used to find the overlay's NSWindow among the process's windows.
+OVERLAY_WINDOW_TITLE = "Todoist Task Overlay"
+
+# Added to each timer delay so ticks land just after a second boundary.
+TICK_SLACK_MS = 10
+# Quiet period after a drag before the corner position is saved.
+POSITION_SAVE_DELAY_MS = 1000
+
+# How long the overlay process waits for Todoist after the window closes.
+COMPLETION_JOIN_TIMEOUT_SECONDS = 30
+
+# Resolved once at import; show_task_overlay re-launches this file.
+_SCRIPT_PATH = str(Path(__file__).resolve())
+_PY = sys.executable
+
+# (font, text) -> (width, linespace) in pixels.
+_FONT_METRICS: Dict[tuple, tuple] = {}
+# font -> linespace in pixels; independent of the text being measured.
+_FONT_LINESPACE: Dict[Any, int] = {}
+
+_todoist_api = None
+_todoist_api_lock = threading.Lock()
+
+
+def get_todoist_api():
+    """Return the process-wide Todoist client, or None without TODOIST_KEY."""
+
+    global _todoist_api
+    with _todoist_api_lock:
+        if _todoist_api is None:
+            todoist_key = os.getenv("TODOIST_KEY")
+            if not todoist_key:
+                return None
+            # Slow to import, and only needed once a task is done.
+            from todoist_api_python.api import TodoistAPI
+
+            _todoist_api = TodoistAPI(todoist_key)
+        return _todoist_api
+
 
 def play_spotify() -> bool:
+    # One osascript process, not waited on; only plays if Spotify is open.
+    script = [
+        'if application "Spotify" is running then',
+        'tell application "Spotify" to play',
+        "else",
+        'tell application "Spotify" to activate',
+        "delay 3",
+        'tell application "Spotify" to play',
+        "end if",
+    ]
+    cmd = ["osascript"]
+    for line in script:
+        cmd.extend(["-e", line])
     try:
-        play_script = 'tell application "Spotify" to play'
-        result = subprocess.run(
-            ["osascript", "-e", play_script],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if "error" in result.stderr.lower() or result.returncode != 0:
-            activate_script = 'tell application "Spotify" to activate'
-            subprocess.run(
-                ["osascript", "-e", activate_script], capture_output=True, timeout=10
-            )
-            time.sleep(3)
-            subprocess.run(
-                ["osascript", "-e", play_script], capture_output=True, timeout=5
-            )
+        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         return True
     except Exception as e:
         print(f"Could not play Spotify: {e}", file=sys.stderr)
         return False
 
 
-def create_rounded_rectangle(canvas, x1, y1, x2, y2, radius, fill, outline="", width=1):
-    points = [
-        x1 + radius,
-        y1,
-        x2 - radius,
-        y1,
-        x2,
-        y1,
-        x2,
-        y1 + radius,
-        x2,
-        y2 - radius,
-        x2,
-        y2,
-        x2 - radius,
-        y2,
-        x1 + radius,
-        y2,
-        x1,
-        y2,
-        x1,
-        y2 - radius,
-        x1,
-        y1 + radius,
-        x1,
-        y1,
-    ]
-    return canvas.create_polygon(
-        points, smooth=True, fill=fill, outline=outline, width=width
-    )
+def set_macos_window_level(root, level: int = NS_STATUS_WINDOW_LEVEL) -> bool:
+    """Set the NSWindow level of root once, so macOS keeps it above others.
+
+    Returns False when not on macOS or the window can't be found, in which
+    case Tk's -topmost attribute is all we have.
+    """
+
+    if sys.platform != "darwin":
+        return False
+    try:
+        import ctypes
+        import ctypes.util
+
+        objc = ctypes.cdll.LoadLibrary(ctypes.util.find_library("objc"))
+        objc.objc_getClass.restype = ctypes.c_void_p
+        objc.objc_getClass.argtypes = [ctypes.c_char_p]
+        objc.sel_registerName.restype = ctypes.c_void_p
+        objc.sel_registerName.argtypes = [ctypes.c_char_p]
+
+        # objc_msgSend must be called through a prototype matching each
+        # selector's signature (required on arm64).
+        msg_send = ctypes.cast(objc.objc_msgSend, ctypes.c_void_p).value
+        vp = ctypes.c_void_p
+        send_id = ctypes.CFUNCTYPE(vp, vp, vp)(msg_send)
+        send_count = ctypes.CFUNCTYPE(ctypes.c_ulong, vp, vp)(msg_send)
+        send_index = ctypes.CFUNCTYPE(vp, vp, vp, ctypes.c_ulong)(msg_send)
+        send_str = ctypes.CFUNCTYPE(ctypes.c_char_p, vp, vp)(msg_send)
+        send_level = ctypes.CFUNCTYPE(None, vp, vp, ctypes.c_long)(msg_send)
+
+        def sel(name: str):
+            return objc.sel_registerName(name.encode())
+
+        title = root.title()
+        app = send_id(objc.objc_getClass(b"NSApplication"), sel("sharedApplication"))
+        windows = send_id(app, sel("windows"))
+        for i in range(send_count(windows, sel("count"))):
+            window = send_index(windows, sel("objectAtIndex:"), i)
+            ns_title = send_id(window, sel("title"))
+            if not ns_title:
+                continue
+            name = send_str(ns_title, sel("UTF8String"))
+            if name is not None and name.decode("utf-8", "replace") == title:
+                send_level(window, sel("setLevel:"), level)
+                return True
+    except Exception as e:
+        print(f"Could not set window level: {e}", file=sys.stderr)
+    return False
+
+
+def measure_text(widget, font, text: str) -> tuple:
+    # Ask Tk directly rather than creating tkinter.font.Font objects, which
+    # can crash on shutdown under some Tcl/Tk builds.
+    key = (font, text)
+    metrics = _FONT_METRICS.get(key)
+    if metrics is None:
+        linespace = _FONT_LINESPACE.get(font)
+        if linespace is None:
+            linespace = int(widget.tk.call("font", "metrics", font, "-linespace"))
+            _FONT_LINESPACE[font] = linespace
+        width = int(widget.tk.call("font", "measure", font, text))
+        metrics = _FONT_METRICS[key] = (width, linespace)
+    return metrics
+
+
+def _render_rounded_rect(master, w, h, radius, fill, bg, outline=None) -> tk.PhotoImage:
+    # Corner pixels are blended with bg by coverage, giving antialiased
+    # edges on an opaque image. With bg=None the corners are left
+    # transparent instead, for images composited over other canvas items.
+    def rgb(color):
+        return tuple(c >> 8 for c in master.winfo_rgb(color))
+
+    def blend(a, b, t):
+        return tuple(round(x + (y - x) * t) for x, y in zip(a, b))
+
+    def hex_color(c):
+        return "#%02x%02x%02x" % c
+
+    fill_rgb = rgb(fill)
+    edge_rgb = rgb(outline) if outline else fill_rgb
+    bg_rgb = rgb(bg) if bg else None
+    solid = hex_color(fill_rgb)
+    edge = hex_color(edge_rgb)
+    r = max(0, min(radius, w // 2, h // 2))
+
+    corners = []
+    clear = []
+    for y in range(r):
+        row = []
+        for x in range(r):
+            d = ((r - x - 0.5) ** 2 + (r - y - 0.5) ** 2) ** 0.5
+            outer = min(1.0, max(0.0, r - d + 0.5))
+            inner = min(1.0, max(0.0, r - 1 - d + 0.5)) if outline else outer
+            color = blend(edge_rgb, fill_rgb, inner)
+            if bg_rgb is not None:
+                color = blend(bg_rgb, color, outer)
+            elif outer < 0.5:
+                clear.append((x, y))
+            row.append(hex_color(color))
+        corners.append(row)
+
+    middle = [solid] * (w - 2 * r)
+    border = [edge] * (w - 2 * r)
+    full_row = "{" + " ".join([edge] + [solid] * (w - 2) + [edge]) + "}"
+    rows = []
+    for y in range(h):
+        cy = y if y < r else h - 1 - y
+        if cy >= r:
+            rows.append(full_row)
+            continue
+        left = corners[cy]
+        span = border if cy == 0 else middle
+        rows.append("{" + " ".join(left + span + left[::-1]) + "}")
+
+    img = tk.PhotoImage(master=master, width=w, height=h)
+    img.put(" ".join(rows))
+    for x, y in clear:
+        for px, py in ((x, y), (w - 1 - x, y), (x, h - 1 - y), (w - 1 - x, h - 1 - y)):
+            img.tk.call(img.name, "transparency", "set", px, py, 1)
+    return img
+
+
+# (interpreter, width, height, radius, fill, bg, outline) -> PhotoImage
+_ROUNDED_RECT_IMAGES: Dict[tuple, tk.PhotoImage] = {}
+
+
+def rounded_rect_image(master, w, h, radius, fill, bg, outline=None) -> tk.PhotoImage:
+    key = (master.tk, w, h, radius, fill, bg, outline)
+    img = _ROUNDED_RECT_IMAGES.get(key)
+    if img is None:
+        img = _render_rounded_rect(master, w, h, radius, fill, bg, outline)
+        _ROUNDED_RECT_IMAGES[key] = img
+    return img
 
 
 def create_styled_button(
@@ -94,74 +255,149 @@ def create_styled_button(
     if font is None:
         font = get_system_font(parent, 14, "bold")
 
-    btn_frame = tk.Frame(parent, bg=parent.cget("bg"))
-    temp_label = tk.Label(parent, text=text, font=font)
-    temp_label.pack_forget()
-    text_width = temp_label.winfo_reqwidth()
-    text_height = temp_label.winfo_reqheight()
-    temp_label.destroy()
+    parent_bg = parent.cget("bg")
+    text_width, text_height = measure_text(parent, font, text)
     width = text_width + padx * 2
     height = text_height + pady * 2
     if radius is None:
         radius = min(width, height) // 2
 
-    canvas = tk.Canvas(
-        btn_frame,
-        width=width,
-        height=height,
-        bg=parent.cget("bg"),
+    # One label over a cached rounded-rect image.
+    button = tk.Label(
+        parent,
+        image=rounded_rect_image(parent, width, height, radius, bg_color, parent_bg),
+        text=text,
+        compound="center",
+        font=font,
+        fg=fg_color,
+        bg=parent_bg,
+        bd=0,
         highlightthickness=0,
+        padx=0,
+        pady=0,
         cursor="hand2",
     )
-    canvas.pack()
-    create_rounded_rectangle(canvas, 0, 0, width, height, radius, fill=bg_color)
-    canvas.create_text(width // 2, height // 2, text=text, font=font, fill=fg_color)
-    canvas.bind("<Button-1>", lambda _e: command())
-    return btn_frame
+    button.bind("<Button-1>", lambda _e, _c=command: _c())
+    return button
+
+
+def create_drag_handle_image(
+    master, color: str = "#ffffff", dot: int = 3, gap: int = 5
+) -> tk.PhotoImage:
+    # Pixels that are never put stay transparent.
+    img = tk.PhotoImage(master=master, width=gap + dot, height=2 * gap + dot)
+    for row in range(3):
+        for col in range(2):
+            x, y = col * gap, row * gap
+            img.put(color, to=(x, y, x + dot, y + dot))
+    return img
+
+
+@functools.lru_cache(maxsize=4096)
+def format_time(seconds: int) -> str:
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+MONO_FONT_CANDIDATES = (
+    "JetBrains Mono",
+    "JetBrainsMono Nerd Font",
+    "JetBrainsMonoNL Nerd Font",
+    "SF Mono",
+    "Menlo",
+    "Monaco",
+)
+SYSTEM_FONT_CANDIDATES = (
+    "SF Pro Text",
+    "SF Pro Display",
+    "Helvetica Neue",
+    "Helvetica",
+    "Arial",
+)
 
+# Installed families and the pick for each candidate list, looked up once.
+_FONT_FAMILIES: Optional[frozenset] = None
+_FONT_PICKS: Dict[tuple, str] = {}
 
-def get_mono_font(root, size: int) -> tuple:
-    candidates = [
-        "JetBrains Mono",
-        "JetBrainsMono Nerd Font",
-        "JetBrainsMonoNL Nerd Font",
-        "SF Mono",
-        "Menlo",
-        "Monaco",
-    ]
+
+def _pick_font_family(root, candidates: tuple, fallback: str) -> str:
+    global _FONT_FAMILIES
+    picked = _FONT_PICKS.get(candidates)
+    if picked is not None:
+        return picked
     try:
-        available = set(tkfont.families(root))
-        for name in candidates:
-            if name in available:
-                return (name, size)
+        if _FONT_FAMILIES is None:
+            _FONT_FAMILIES = frozenset(tkfont.families(root))
     except Exception:
-        pass
-    return ("Menlo", size)
+        return fallback
+    picked = next((name for name in candidates if name in _FONT_FAMILIES), fallback)
+    _FONT_PICKS[candidates] = picked
+    return picked
+
+
+def get_mono_font(root, size: int) -> tuple:
+    return (_pick_font_family(root, MONO_FONT_CANDIDATES, "Menlo"), size)
 
 
 def get_system_font(root, size: int, weight: str | None = None) -> tuple:
-    candidates = [
-        "SF Pro Text",
-        "SF Pro Display",
-        "Helvetica Neue",
-        "Helvetica",
-        "Arial",
-    ]
-    try:
-        available = set(tkfont.families(root))
-        for name in candidates:
-            if name in available:
-                if weight:
-                    return (name, size, weight)
-                return (name, size)
-    except Exception:
-        pass
+    name = _pick_font_family(root, SYSTEM_FONT_CANDIDATES, "Helvetica")
     if weight:
-        return ("Helvetica", size, weight)
-    return ("Helvetica", size)
+        return (name, size, weight)
+    return (name, size)
 
 
 class TaskOverlayWindow:
+    # Every attribute is declared up front; progress_canvas and the corner
+    # items stay unset until build_corner, so hasattr() still works on them.
+    __slots__ = (
+        "task_name",
+        "task_id",
+        "description",
+        "mode",
+        "elapsed_seconds",
+        "estimated_duration",
+        "_progress_scale",
+        "root",
+        "time_var",
+        "progress_var",
+        "running",
+        "completed",
+        "result",
+        "_completion_thread",
+        "timer_started",
+        "start_time",
+        "dragging",
+        "drag_x",
+        "drag_y",
+        "_pending_position",
+        "_drag_origin",
+        "_drag_handle_img",
+        "_flush_after_id",
+        "timer_after_id",
+        "_tick",
+        "hover_hide_after_id",
+        "is_hovering",
+        "_last_shown_sec",
+        "_last_fill_px",
+        "_canvas_w",
+        "_canvas_h",
+        "_pc_path",
+        "_tkcall",
+        "_active_entry",
+        "_corner_position",
+        "_state_dirty",
+        "snooze_count",
+        "snooze_until",
+        "progress_canvas",
+        "progress_rect",
+        "progress_border",
+        "complete_box",
+        "complete_text",
+    )
+
     def __init__(
         self,
         task_name: str,
@@ -169,7 +405,6 @@ class TaskOverlayWindow:
         description: str = "",
         mode: str = "full",
         elapsed_seconds: float = 0,
-        output_file: str | None = None,
         estimated_duration: float = 30,
     ):
         self.task_name = task_name
@@ -177,8 +412,9 @@ class TaskOverlayWindow:
         self.description = description
         self.mode = mode
         self.elapsed_seconds = elapsed_seconds
-        self.output_file = output_file or "/tmp/task_overlay_result.json"
         self.estimated_duration = float(estimated_duration)
+        # Percent of the estimate per elapsed second.
+        self._progress_scale = 100.0 / max(1.0, self.estimated_duration * 60.0)
 
         self.root: Optional[tk.Tk] = None
         self.time_var: Optional[tk.StringVar] = None
@@ -186,6 +422,9 @@ class TaskOverlayWindow:
 
         self.running = True
         self.completed = False
+        # Reported to the parent process on stdout once the window closes.
+        self.result: Optional[Dict[str, Any]] = None
+        self._completion_thread: Optional[threading.Thread] = None
 
         self.timer_started = elapsed_seconds > 0
         self.start_time = (
@@ -195,27 +434,35 @@ class TaskOverlayWindow:
         self.dragging = False
         self.drag_x = 0
         self.drag_y = 0
+        self._pending_position: Optional[tuple] = None
+        self._drag_origin: Optional[tuple] = None
+        self._drag_handle_img: Optional[tk.PhotoImage] = None
+        self._flush_after_id = None
 
         self.timer_after_id = None
-        self.ensure_after_id = None
+        self._tick = 0
         self.hover_hide_after_id = None
         self.is_hovering = False
+        # Last values pushed to Tk, so unchanged ticks skip the Tcl calls.
+        self._last_shown_sec = -1
+        self._last_fill_px = -1
+        self._canvas_w = 0
+        self._canvas_h = 0
+        # Tcl path and tk.call of the corner canvas, for direct itemconfigure.
+        self._pc_path: Optional[str] = None
+        self._tkcall = None
+
+        # This task's active_tasks entry and corner position; _write_state
+        # merges them into the file.
+        self._active_entry: Optional[dict] = None
+        self._corner_position: Optional[dict] = None
+        self._state_dirty = False
 
         # Load snooze count from state
-        state = load_state()
-        task_state = state.get("active_tasks", {}).get(task_id, {})
+        task_state = load_state().get("active_tasks", {}).get(task_id, {})
         self.snooze_count = task_state.get("snooze_count", 0)
         self.snooze_until = task_state.get("snooze_until", 0)
 
-    def format_time(self, seconds: float) -> str:
-        minutes = int(seconds // 60)
-        seconds = int(seconds % 60)
-        hours = minutes // 60
-        minutes = minutes % 60
-        if hours > 0:
-            return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-        return f"{minutes:02d}:{seconds:02d}"
-
     def on_snooze(self):
         """Handle snooze button press. First snooze is free, subsequent ones require AI justification."""
         if self.snooze_count == 0:
@@ -307,13 +554,12 @@ class TaskOverlayWindow:
 
     def _do_snooze(self):
         """Execute the snooze: close overlay and schedule reappear in 5 minutes."""
+        self.running = False
         self.snooze_count += 1
         self.snooze_until = time.time() + 300  # 5 minutes
 
         # Save snooze state
-        state = load_state()
-        state.setdefault("active_tasks", {})
-        state["active_tasks"][self.task_id] = {
+        self._active_entry = {
             "task_name": self.task_name,
             "description": self.description,
             "elapsed_seconds": self.elapsed_seconds,
@@ -324,13 +570,14 @@ class TaskOverlayWindow:
             "snooze_until": self.snooze_until,
             "snoozed": True,
         }
-        save_state(state)
+        self._write_state()
 
         # Close the overlay without recording completion
         if self.root:
             self.root.destroy()
 
     def _handle_postpone(self, reason: str) -> None:
+        self.running = False
         is_sleep = self._is_sleep_reason(reason)
         now = time.time()
         sleep_until = None
@@ -340,9 +587,7 @@ class TaskOverlayWindow:
         postpone_minutes = 30
         postpone_until = now + (postpone_minutes * 60)
 
-        state = load_state()
-        state.setdefault("active_tasks", {})
-        state["active_tasks"][self.task_id] = {
+        self._active_entry = {
             "task_name": self.task_name,
             "description": self.description,
             "elapsed_seconds": self.elapsed_seconds,
@@ -353,21 +598,15 @@ class TaskOverlayWindow:
             "snooze_until": sleep_until or postpone_until,
             "snoozed": True,
         }
-        if is_sleep and sleep_until is not None:
-            state["sleep_until"] = sleep_until
-        save_state(state)
+        self._write_state(sleep_until=sleep_until if is_sleep else None)
 
-        Path(self.output_file).write_text(
-            json.dumps(
-                {
-                    "task_id": self.task_id,
-                    "elapsed_seconds": self.elapsed_seconds,
-                    "completed": False,
-                    "postponed": True,
-                    "sleep": bool(is_sleep),
-                }
-            )
-        )
+        self.result = {
+            "task_id": self.task_id,
+            "elapsed_seconds": self.elapsed_seconds,
+            "completed": False,
+            "postponed": True,
+            "sleep": bool(is_sleep),
+        }
 
         if self.root:
             self.root.destroy()
@@ -388,6 +627,9 @@ class TaskOverlayWindow:
         )
 
         try:
+            # Only the postpone dialogs need requests.
+            import requests
+
             response = requests.post(
                 f"{proxy_url}/chat/completions",
                 headers={
@@ -645,48 +887,64 @@ class TaskOverlayWindow:
         if not self.running or not self.root:
             return
 
-        self.root.lift()
-        self.root.attributes("-topmost", True)
-
         if not self.timer_started:
-            self.timer_after_id = self.root.after(100, self.update_timer)
+            # Nothing to tick until START; on_start restarts the loop.
             return
 
         elapsed = time.time() - self.start_time
-        if self.time_var:
-            self.time_var.set(self.format_time(elapsed))
-
-        if hasattr(self, "progress_canvas"):
-            self.progress_canvas.itemconfig("time_text", text=self.format_time(elapsed))
+        elapsed_second = int(elapsed)
+        if elapsed_second != self._last_shown_sec:
+            self._last_shown_sec = elapsed_second
+            time_text = format_time(elapsed_second)
+            if self.time_var:
+                self.time_var.set(time_text)
+            if self._pc_path:
+                self._tkcall(
+                    self._pc_path, "itemconfigure", "time_text", "-text", time_text
+                )
 
+        # The corner view draws straight onto its canvas; only the full-screen
+        # widgets are bound to time_var / progress_var.
+        progress = min(100.0, elapsed * self._progress_scale)
         if self.progress_var:
-            estimated_seconds = max(1.0, self.estimated_duration * 60.0)
-            progress = min(100.0, (elapsed / estimated_seconds) * 100.0)
             self.progress_var.set(progress)
-
-            if hasattr(self, "progress_canvas") and hasattr(self, "progress_rect"):
-                width = self.progress_canvas.winfo_width()
-                fill_width = (width * progress) / 100.0
-                canvas_height = self.progress_canvas.winfo_height()
+        if self.mode == "corner" and hasattr(self, "progress_rect"):
+            fill_width = int((self._canvas_w * progress) / 100.0)
+            last_fill = self._last_fill_px
+            if fill_width != last_fill:
+                self._last_fill_px = fill_width
+                canvas_height = self._canvas_h
                 self.progress_canvas.coords(
                     self.progress_rect, 0, 0, fill_width, canvas_height
                 )
                 if hasattr(self, "progress_border"):
-                    self.progress_canvas.coords(
-                        self.progress_border, fill_width, 0, fill_width, canvas_height
-                    )
-
-        if int(elapsed) % 5 == 0:
+                    if last_fill < 0:
+                        # After a rebuild or resize, anchor the border
+                        # to the new canvas height.
+                        self.progress_canvas.coords(
+                            self.progress_border,
+                            fill_width,
+                            0,
+                            fill_width,
+                            canvas_height,
+                        )
+                    else:
+                        self.progress_canvas.move(
+                            self.progress_border, fill_width - last_fill, 0
+                        )
+
+        self._tick += 1
+        if self._tick % STATE_FLUSH_TICKS == 0:
             self.save_current_state()
+            self._write_state()
 
-        self.timer_after_id = self.root.after(100, self.update_timer)
+        # Wake just after the next elapsed-second boundary.
+        delay = 1000 - int((elapsed * 1000) % 1000) + TICK_SLACK_MS
+        self.timer_after_id = self.root.after(delay, self.update_timer)
 
     def save_current_state(self):
-        state = load_state()
         elapsed = time.time() - self.start_time
-        state.setdefault("active_tasks", {})
-        state.setdefault("completed_tasks", [])
-        state["active_tasks"][self.task_id] = {
+        self._active_entry = {
             "task_name": self.task_name,
             "description": self.description,
             "elapsed_seconds": elapsed,
@@ -694,7 +952,27 @@ class TaskOverlayWindow:
             "last_updated": time.time(),
             "estimated_duration": self.estimated_duration,
         }
+        self._state_dirty = True
+
+    def _write_state(self, drop_entry=False, completed=None, sleep_until=None):
+        # Other processes write this file too, so merge into its contents.
+        state = load_state()
+        active = state.setdefault("active_tasks", {})
+        if drop_entry:
+            active.pop(self.task_id, None)
+        elif self._active_entry is not None:
+            active[self.task_id] = self._active_entry
+        if self._corner_position is not None:
+            positions = state.setdefault("corner_position", {})
+            positions[self.task_id] = self._corner_position
+        if completed is not None:
+            completed_tasks = state.setdefault("completed_tasks", [])
+            completed_tasks.append(completed)
+            del completed_tasks[:-COMPLETED_TASKS_KEPT]
+        if sleep_until is not None:
+            state["sleep_until"] = sleep_until
         save_state(state)
+        self._state_dirty = False
 
     def on_start(self):
         self.timer_started = True
@@ -702,27 +980,8 @@ class TaskOverlayWindow:
         play_spotify()
         self.mode = "corner"
         self.save_current_state()
-
-        old_root = self.root
-        if self.timer_after_id and old_root:
-            try:
-                old_root.after_cancel(self.timer_after_id)
-            except Exception:
-                pass
-        if self.ensure_after_id and old_root:
-            try:
-                old_root.after_cancel(self.ensure_after_id)
-            except Exception:
-                pass
-        self.timer_after_id = None
-        self.ensure_after_id = None
-
-        self.root = tk.Tk()
-        if old_root:
-            old_root.destroy()
-        self.build_corner()
-        self.update_timer()
-        self.ensure_after_id = self.root.after(100, self.ensure_on_top)
+        self._write_state()
+        self.rebuild_window()
 
     def on_done(self):
         self.completed = True
@@ -731,47 +990,28 @@ class TaskOverlayWindow:
         elapsed = time.time() - self.start_time
         elapsed_minutes = elapsed / 60.0
 
-        try:
-            todoist_key = os.getenv("TODOIST_KEY")
-            if todoist_key:
-                api = TodoistAPI(todoist_key)
-                try:
-                    api.get_task(self.task_id)
-                except Exception:
-                    api = None
-                if api is not None:
-                    api.complete_task(self.task_id)
-        except Exception as e:
-            print(f"Could not complete task in Todoist: {e}", file=sys.stderr)
-
-        record_task_completion(
-            task_id=self.task_id,
-            task_name=self.task_name,
-            estimated_minutes=int(self.estimated_duration),
-            actual_minutes=elapsed_minutes,
-            completed=True,
+        # Off the Tk thread so the window closes at once; run() joins it.
+        self._completion_thread = threading.Thread(
+            target=self._complete_in_background, args=(elapsed_minutes,), daemon=True
         )
+        self._completion_thread.start()
 
-        state = load_state()
-        state.setdefault("active_tasks", {})
-        state.setdefault("completed_tasks", [])
-        if self.task_id in state["active_tasks"]:
-            del state["active_tasks"][self.task_id]
-        state["completed_tasks"].append(
-            {
+        self._active_entry = None
+        self._write_state(
+            drop_entry=True,
+            completed={
                 "task_id": self.task_id,
                 "task_name": self.task_name,
                 "elapsed_seconds": elapsed,
                 "completed_at": time.time(),
-            }
+            },
         )
-        save_state(state)
 
-        Path(self.output_file).write_text(
-            json.dumps(
-                {"task_id": self.task_id, "elapsed_seconds": elapsed, "completed": True}
-            )
-        )
+        self.result = {
+            "task_id": self.task_id,
+            "elapsed_seconds": elapsed,
+            "completed": True,
+        }
         if self.root:
             self.root.destroy()
 
@@ -780,32 +1020,48 @@ class TaskOverlayWindow:
         elapsed = time.time() - self.start_time
         elapsed_minutes = elapsed / 60.0
 
+        self._record_completion(elapsed_minutes, completed=False)
+
+        self._active_entry = None
+        self._write_state(drop_entry=True)
+
+        self.result = {
+            "task_id": self.task_id,
+            "elapsed_seconds": elapsed,
+            "completed": False,
+        }
+        if self.root:
+            self.root.destroy()
+
+    def _complete_in_background(self, elapsed_minutes: float):
+        try:
+            api = get_todoist_api()
+            if api is not None:
+                try:
+                    api.get_task(self.task_id)
+                except Exception:
+                    api = None
+                if api is not None:
+                    api.complete_task(self.task_id)
+        except Exception as e:
+            print(f"Could not complete task in Todoist: {e}", file=sys.stderr)
+
+        self._record_completion(elapsed_minutes, completed=True)
+
+    def _record_completion(self, elapsed_minutes: float, completed: bool):
+        try:
+            from src.analytics import record_task_completion
+        except ImportError as e:
+            print(f"Could not record task analytics: {e}", file=sys.stderr)
+            return
         record_task_completion(
             task_id=self.task_id,
             task_name=self.task_name,
             estimated_minutes=int(self.estimated_duration),
             actual_minutes=elapsed_minutes,
-            completed=False,
+            completed=completed,
         )
 
-        state = load_state()
-        state.setdefault("active_tasks", {})
-        if self.task_id in state["active_tasks"]:
-            del state["active_tasks"][self.task_id]
-        save_state(state)
-
-        Path(self.output_file).write_text(
-            json.dumps(
-                {
-                    "task_id": self.task_id,
-                    "elapsed_seconds": elapsed,
-                    "completed": False,
-                }
-            )
-        )
-        if self.root:
-            self.root.destroy()
-
     def on_minimize(self):
         self.mode = "corner"
         self.rebuild_window()
@@ -814,6 +1070,8 @@ class TaskOverlayWindow:
         self.dragging = True
         self.drag_x = event.x
         self.drag_y = event.y
+        if self.root:
+            self._drag_origin = (self.root.winfo_x(), self.root.winfo_y())
 
     def do_drag(self, event):
         if not self.dragging or not self.root:
@@ -826,19 +1084,42 @@ class TaskOverlayWindow:
         self.dragging = False
         if self.mode != "corner" or not self.root:
             return
-        state = load_state()
-        state.setdefault("corner_position", {})
-        state["corner_position"][self.task_id] = {
-            "x": self.root.winfo_x(),
-            "y": self.root.winfo_y(),
-        }
-        save_state(state)
+        position = (self.root.winfo_x(), self.root.winfo_y())
+        if position == self._drag_origin:
+            # A plain click; nothing moved, so nothing to save.
+            return
+        # Coalesce a burst of repositioning into a single state write.
+        self._pending_position = position
+        if self._flush_after_id:
+            try:
+                self.root.after_cancel(self._flush_after_id)
+            except Exception:
+                pass
+        self._flush_after_id = self.root.after(
+            POSITION_SAVE_DELAY_MS, self._flush_position
+        )
 
-    def ensure_on_top(self):
-        if self.root and self.mode == "corner":
+    def _flush_position(self):
+        self._flush_after_id = None
+        if self._pending_position is None:
+            return
+        x, y = self._pending_position
+        self._pending_position = None
+        self._corner_position = {"x": x, "y": y}
+        self._write_state()
+
+    def _pin_on_top(self):
+        # Full screen stays at -topmost so its dialogs can appear above it.
+        if not self.root:
+            return
+        self.root.attributes("-topmost", True)
+        self.root.lift()
+        if self.mode == "corner":
+            set_macos_window_level(self.root)
+
+    def _on_visibility(self, event):
+        if event.widget is self.root and event.state != "VisibilityUnobscured":
             self.root.lift()
-            self.root.attributes("-topmost", True)
-            self.ensure_after_id = self.root.after(100, self.ensure_on_top)
 
     def build_full_screen(self):
         assert self.root
@@ -848,11 +1129,11 @@ class TaskOverlayWindow:
         sh = self.root.winfo_screenheight()
         self.root.geometry(f"{sw}x{sh}+0+0")
         self.root.configure(bg="#1a1a1a")
-        self.root.attributes("-topmost", True)
-        self.root.lift()
+        # Runs after Tk's own idle handler has mapped the window.
+        self.root.after_idle(self._pin_on_top)
 
+        # Placed after its children are packed, so it is laid out once.
         content = tk.Frame(self.root, bg="#1a1a1a")
-        content.place(relx=0.5, rely=0.5, anchor="center")
 
         tk.Label(
             content,
@@ -922,7 +1203,7 @@ class TaskOverlayWindow:
                 pady=10,
             ).pack(pady=(30, 0))
         else:
-            self.time_var = tk.StringVar(value=self.format_time(self.elapsed_seconds))
+            self.time_var = tk.StringVar(value=format_time(int(self.elapsed_seconds)))
             tk.Label(
                 content,
                 textvariable=self.time_var,
@@ -989,6 +1270,8 @@ class TaskOverlayWindow:
                 pady=15,
             ).pack(pady=(0, 15))
 
+        content.place(relx=0.5, rely=0.5, anchor="center")
+
         self.root.grab_set()
         self.root.bind("<Escape>", lambda _e: None)
         self.root.bind("<Command-w>", lambda _e: "break")
@@ -998,69 +1281,61 @@ class TaskOverlayWindow:
         assert self.root
         width, height = 300, 50
         self.root.overrideredirect(True)
+        self.root.configure(bg="#333333")
 
         try:
             self.root.tk.call("tk", "scaling", 1.0)
         except Exception:
             pass
 
-        self.root.geometry(f"{width}x{height}")
-        self.root.update_idletasks()
-
         sw = self.root.winfo_screenwidth()
         sh = self.root.winfo_screenheight()
         x = (sw - width) // 2
         y = sh - height - 40
         self.root.geometry(f"{width}x{height}+{x}+{y}")
-        self.root.attributes("-topmost", True)
 
         self.root.bind("<Button-1>", self.start_drag)
         self.root.bind("<B1-Motion>", self.do_drag)
         self.root.bind("<ButtonRelease-1>", self.stop_drag)
+        # Re-raise when covered, where the window level can't be pinned.
+        self.root.bind("<Visibility>", self._on_visibility)
 
         self.progress_canvas = tk.Canvas(
             self.root, width=width, height=height, bg="#333333", highlightthickness=0
         )
         self.progress_canvas.pack(fill=tk.BOTH, expand=True)
+        self._pc_path = str(self.progress_canvas)
+        self._tkcall = self.progress_canvas.tk.call
 
         self.progress_rect = self.progress_canvas.create_rectangle(
-            0, 0, 0, height, fill="#287a3e", outline="", stipple="gray25"
+            0, 0, 0, height, fill="#287a3e", outline=""
         )
         self.progress_border = self.progress_canvas.create_line(
             0, 0, 0, height, fill="#3d9c5a", width=1
         )
 
-        self.time_var = tk.StringVar(
-            master=self.root, value=self.format_time(self.elapsed_seconds)
-        )
         mono_font = get_mono_font(self.root, 11)
         self.progress_canvas.create_text(
             12 + 35,
             height // 2,
-            text=self.format_time(self.elapsed_seconds),
+            text=format_time(int(self.elapsed_seconds)),
             font=mono_font,
             fill="#ffffff",
-            tags="time_text",
+            tags=("time_text", "hover_text"),
             anchor="center",
         )
 
-        dot_color = "#ffffff"
-        dot_r = 1.5
-        dot_gap = 5
+        # The 2x3 drag-handle dots as one image, kept on the root.
+        if self._drag_handle_img is None:
+            self._drag_handle_img = create_drag_handle_image(self.root)
         dot_start_x = width - 16
         dot_start_y = (height // 2) - 6
-        for row in range(3):
-            for col in range(2):
-                dx = dot_start_x + (col * dot_gap)
-                dy = dot_start_y + (row * dot_gap)
-                self.progress_canvas.create_oval(
-                    dx - dot_r,
-                    dy - dot_r,
-                    dx + dot_r,
-                    dy + dot_r,
-                    fill=dot_color,
-                    outline=dot_color,
-                )
+        self.progress_canvas.create_image(
+            dot_start_x - 1,
+            dot_start_y - 1,
+            image=self._drag_handle_img,
+            anchor="nw",
+        )
 
         display_name = (
             self.task_name[:22] + "..." if len(self.task_name) > 22 else self.task_name
@@ -1071,7 +1346,7 @@ class TaskOverlayWindow:
             text=display_name,
             font=get_system_font(self.root, 11),
             fill="#ffffff",
-            tags="task_text",
+            tags=("task_text", "hover_text"),
             anchor="w",
         )
 
@@ -1080,32 +1355,30 @@ class TaskOverlayWindow:
         btn_pad_y = 5
         complete_text = "Complete"
 
-        # Avoid creating tkinter.font.Font objects (can crash on shutdown
-        # under some Tcl/Tk builds). Measure via canvas bbox instead.
-        tmp1 = self.progress_canvas.create_text(
-            0, 0, text=complete_text, font=system_font, anchor="nw"
+        btn_w, btn_height = measure_text(
+            self.progress_canvas, system_font, complete_text
         )
-        bbox1 = self.progress_canvas.bbox(tmp1) or (0, 0, 0, 0)
-        self.progress_canvas.delete(tmp1)
-        btn_w = bbox1[2] - bbox1[0]
-        btn_height = bbox1[3] - bbox1[1]
 
         complete_x = 15
         complete_y = height // 2
 
-        self.complete_box = create_rounded_rectangle(
-            self.progress_canvas,
-            complete_x - btn_pad_x,
-            complete_y - (btn_height // 2) - btn_pad_y,
-            complete_x + btn_w + btn_pad_x,
-            complete_y + (btn_height // 2) + btn_pad_y,
+        # Cached image with transparent corners.
+        shell = rounded_rect_image(
+            self.root,
+            btn_w + 2 * btn_pad_x,
+            (btn_height // 2) * 2 + 2 * btn_pad_y,
             22,
-            fill="#222222",
+            "#222222",
+            None,
             outline="#444444",
-            width=1,
         )
-        self.progress_canvas.itemconfig(
-            self.complete_box, state="hidden", tags=("btn_complete_box",)
+        self.complete_box = self.progress_canvas.create_image(
+            complete_x - btn_pad_x,
+            complete_y - (btn_height // 2) - btn_pad_y,
+            image=shell,
+            anchor="nw",
+            state="hidden",
+            tags=("btn_complete_box", "hover_btns"),
         )
         self.complete_text = self.progress_canvas.create_text(
             complete_x + (btn_w / 2),
@@ -1113,104 +1386,130 @@ class TaskOverlayWindow:
             text=complete_text,
             font=system_font,
             fill="#ffffff",
-            tags="btn_complete",
+            tags=("btn_complete", "hover_btns"),
             anchor="center",
             state="hidden",
         )
 
-        self.progress_canvas.tag_bind(
-            "btn_complete", "<Button-1>", lambda _e: self.on_done()
-        )
-        self.progress_canvas.tag_bind(
-            "btn_complete_box", "<Button-1>", lambda _e: self.on_done()
-        )
-        self.progress_canvas.tag_bind(
-            "btn_complete",
-            "<Enter>",
-            lambda _e: self.progress_canvas.itemconfig("btn_complete", fill="#cccccc"),
-        )
-        self.progress_canvas.tag_bind(
-            "btn_complete",
-            "<Leave>",
-            lambda _e: self.progress_canvas.itemconfig("btn_complete", fill="#ffffff"),
-        )
+        for tag, sequence, method, args in CORNER_TAG_BINDINGS:
+            self.progress_canvas.tag_bind(
+                tag,
+                sequence,
+                lambda _e, _h=getattr(self, method), _a=args: _h(*_a),
+            )
 
         self.is_hovering = False
         self.hover_hide_after_id = None
+        # The canvas fills the window, so these are the window's crossings.
+        self.progress_canvas.bind("<Enter>", self._on_hover_enter)
+        self.progress_canvas.bind("<Leave>", self._on_hover_leave)
+
+        self.root.update_idletasks()
+        # Canvas size for update_timer; refreshed on <Configure>.
+        self._canvas_w = self.progress_canvas.winfo_width()
+        self._canvas_h = self.progress_canvas.winfo_height()
+        self.progress_canvas.bind("<Configure>", self._on_canvas_configure)
+        # Deferred like full screen so it applies after the window is mapped.
+        self.root.after_idle(self._pin_on_top)
+
+    def _set_state(self, tag, state):
+        # Straight to Tcl, skipping Canvas.itemconfig's option handling.
+        self._tkcall(self._pc_path, "itemconfigure", tag, "-state", state)
+
+    def _set_fill(self, tag, fill):
+        self._tkcall(self._pc_path, "itemconfigure", tag, "-fill", fill)
+
+    def _cancel_hover_hide(self):
+        if self.hover_hide_after_id and self.root:
+            try:
+                self.root.after_cancel(self.hover_hide_after_id)
+            except Exception:
+                pass
+        self.hover_hide_after_id = None
 
-        def do_hide():
-            if not self.is_hovering and self.root:
-                self.progress_canvas.itemconfig("btn_complete", state="hidden")
-                self.progress_canvas.itemconfig("btn_complete_box", state="hidden")
-                self.progress_canvas.itemconfig("time_text", state="normal")
-                self.progress_canvas.itemconfig("task_text", state="normal")
-            self.hover_hide_after_id = None
+    def _on_hover_enter(self, _event):
+        self._cancel_hover_hide()
+        if self.is_hovering:
+            return
+        self.is_hovering = True
+        self._set_state("hover_text", "hidden")
+        self._set_state("hover_btns", "normal")
 
-        def check_mouse_hover():
-            if not self.root:
-                return
-            mouse_x = self.root.winfo_pointerx()
-            mouse_y = self.root.winfo_pointery()
-            win_x = self.root.winfo_x()
-            win_y = self.root.winfo_y()
-            win_w = self.root.winfo_width()
-            win_h = self.root.winfo_height()
-
-            is_over = (
-                win_x <= mouse_x <= win_x + win_w and win_y <= mouse_y <= win_y + win_h
-            )
-            if is_over and not self.is_hovering:
-                self.is_hovering = True
-                if self.hover_hide_after_id:
-                    try:
-                        self.root.after_cancel(self.hover_hide_after_id)
-                    except Exception:
-                        pass
-                    self.hover_hide_after_id = None
-                self.progress_canvas.itemconfig("time_text", state="hidden")
-                self.progress_canvas.itemconfig("task_text", state="hidden")
-                self.progress_canvas.itemconfig("btn_complete", state="normal")
-                self.progress_canvas.itemconfig("btn_complete_box", state="normal")
-            elif not is_over and self.is_hovering:
-                self.is_hovering = False
-                if self.hover_hide_after_id:
-                    try:
-                        self.root.after_cancel(self.hover_hide_after_id)
-                    except Exception:
-                        pass
-                self.hover_hide_after_id = self.root.after(150, do_hide)
-
-            self.root.after(50, check_mouse_hover)
-
-        self.root.after(50, check_mouse_hover)
-        self.progress_var = tk.DoubleVar(master=self.root, value=0)
+    def _on_hover_leave(self, _event):
+        if not self.is_hovering or not self.root:
+            return
+        self.is_hovering = False
+        self._cancel_hover_hide()
+        self.hover_hide_after_id = self.root.after(150, self._hide_hover)
+
+    def _hide_hover(self):
+        self.hover_hide_after_id = None
+        if self.is_hovering or not self.root:
+            return
+        self._set_state("hover_btns", "hidden")
+        self._set_state("hover_text", "normal")
+
+    def _cancel_loops(self):
+        if not self.root:
+            return
+        if self.timer_after_id:
+            try:
+                self.root.after_cancel(self.timer_after_id)
+            except Exception:
+                pass
+        self.timer_after_id = None
+        self._cancel_hover_hide()
+
+    def _on_canvas_configure(self, event):
+        self._canvas_w = event.width
+        self._canvas_h = event.height
+        self._last_fill_px = -1
 
     def rebuild_window(self):
+        # Reuses the Tk root; only children and geometry change.
+        assert self.root
+        self._cancel_loops()
+        self.root.grab_release()
+        # Hidden so the intermediate layout is never drawn.
+        self.root.withdraw()
+        # Root bindings outlive the children; drop the previous mode's.
+        for sequence in ROOT_BINDINGS:
+            try:
+                self.root.unbind(sequence)
+            except tk.TclError:
+                pass
+        for widget in self.root.winfo_children():
+            widget.destroy()
+        self.time_var = None
+        self.progress_var = None
+        self._pc_path = None
+        self._tkcall = None
+
         if self.mode == "corner":
-            old_root = self.root
-            self.root = tk.Tk()
-            if old_root:
-                old_root.destroy()
             self.build_corner()
-            self.update_timer()
-            self.ensure_after_id = self.root.after(100, self.ensure_on_top)
-            return
-
-        if self.root:
-            for widget in self.root.winfo_children():
-                widget.destroy()
-        self.build_full_screen()
+        else:
+            self.build_full_screen()
+        self.root.deiconify()
+        self._last_shown_sec = -1
+        self._last_fill_px = -1
         self.update_timer()
 
     def run(self) -> bool:
         self.root = tk.Tk()
+        self.root.title(OVERLAY_WINDOW_TITLE)
         if self.mode == "full":
             self.build_full_screen()
         else:
             self.build_corner()
-            self.ensure_after_id = self.root.after(100, self.ensure_on_top)
         self.update_timer()
         self.root.mainloop()
+        self._flush_position()
+        if self.running and self.timer_started:
+            self.save_current_state()
+        if self._state_dirty:
+            self._write_state()
+        if self._completion_thread is not None:
+            self._completion_thread.join(timeout=COMPLETION_JOIN_TIMEOUT_SECONDS)
         return self.completed
 
 
@@ -1220,18 +1519,24 @@ def create_overlay(
     description: str = "",
     mode: str = "full",
     elapsed_seconds: float = 0,
-    output_file: str | None = None,
     estimated_duration: float = 30,
-):
-    return TaskOverlayWindow(
+) -> Dict[str, Any]:
+    window = TaskOverlayWindow(
         task_name=task_name,
         task_id=task_id,
         description=description,
         mode=mode,
         elapsed_seconds=elapsed_seconds,
-        output_file=output_file,
         estimated_duration=estimated_duration,
-    ).run()
+    )
+    completed = window.run()
+    if window.result is not None:
+        return window.result
+    return {
+        "task_id": task_id,
+        "elapsed_seconds": float(elapsed_seconds),
+        "completed": completed,
+    }
 
 
 def show_task_overlay(
@@ -1242,12 +1547,9 @@ def show_task_overlay(
     elapsed_seconds: float = 0,
     estimated_duration: float = 30,
 ) -> dict:
-    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
-        result_file = f.name
-    overlay_path = Path(__file__).resolve()
     cmd = [
-        sys.executable,
-        str(overlay_path),
+        _PY,
+        _SCRIPT_PATH,
         "--task-name",
         task_name,
         "--task-id",
@@ -1256,22 +1558,20 @@ def show_task_overlay(
         mode,
         "--elapsed",
         str(elapsed_seconds),
-        "--output",
-        result_file,
         "--estimated-duration",
         str(estimated_duration),
     ]
     if description:
         cmd.extend(["--description", description])
 
-    proc = subprocess.Popen(cmd)
-    proc.wait()
+    # The overlay reports its result as the last line on stdout.
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    out, _ = proc.communicate()
 
+    last_line = (out or "").rstrip().rpartition("\n")[2]
     try:
-        result = json.loads(Path(result_file).read_text())
-        Path(result_file).unlink(missing_ok=True)
-        return result
-    except Exception:
+        return json.loads(last_line)
+    except ValueError:
         return {"completed": False, "elapsed_seconds": 0}
 
 
@@ -1304,7 +1604,6 @@ def _parse_args(argv: list[str]):
     parser.add_argument("--description", default="")
     parser.add_argument("--mode", default="full")
     parser.add_argument("--elapsed", type=float, default=0)
-    parser.add_argument("--output", required=True)
     parser.add_argument("--estimated-duration", type=float, default=30)
     return parser.parse_args(argv)
 
@@ -1317,27 +1616,9 @@ def _main(argv: Optional[list[str]] = None) -> None:
         description=args.description,
         mode=args.mode,
         elapsed_seconds=args.elapsed,
-        output_file=args.output,
         estimated_duration=args.estimated_duration,
     )
-    # Best-effort: if the overlay exits without writing the result file,
-    # write a default so the parent process can continue.
-    try:
-        out_path = Path(args.output)
-        if not out_path.exists():
-            out_path.write_text(
-                json.dumps(
-                    {
-                        "task_id": args.task_id,
-                        "elapsed_seconds": float(args.elapsed),
-                        "completed": bool(result),
-                    }
-                )
-            )
-    except Exception:
-        pass
-
-    print(json.dumps({"completed": result}))
+    sys.stdout.write(json.dumps(result, separators=(",", ":")) + "\n")
     sys.stdout.flush()
 
     # Work around occasional Tk/Tcl shutdown malloc crashes by skipping